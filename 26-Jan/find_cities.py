@@ -4,15 +4,39 @@ Find top 3 cities/regions near each coordinate point and display on map.
 """
 
 import sys
+import heapq
+import json
+import math
+import shelve
+import threading
 from typing import List, Tuple, Dict
-from timezonefinder import TimezoneFinder
-import pytz
-from datetime import datetime
-import folium
-from geopy.geocoders import Nominatim
-from geopy.distance import geodesic
-import time
+from functools import lru_cache, partial
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
 
+# timezonefinder, pytz and geopy are imported where they are first used so
+# that the script starts quickly and fails fast when input files are missing
+
+GEOCODE_WORKERS = 8
+
+# Worker pool shared by every line so threads are started once per run;
+# the geocoder's rate limiter still caps the request rate
+geocode_executor = ThreadPoolExecutor(max_workers=GEOCODE_WORKERS, thread_name_prefix="geocode")
+
+# Characters stripped from data.txt lines before reading digits
+DIGIT_CLEANUP = str.maketrans("", "", "_ \t\r\n")
+
+# WGS84 ellipsoid, used by the cheap-ruler distance approximation
+WGS84_RADIUS_KM = 6378.137
+WGS84_FLATTENING = 1 / 298.257223563
+WGS84_E2 = WGS84_FLATTENING * (2 - WGS84_FLATTENING)
+
+# Raw reverse-geocode results persisted across runs, keyed by 0.1° grid cell
+GEOCACHE_FILE = "geocache.db"
+geocache_lock = threading.Lock()
+
+@lru_cache(maxsize=1024)
 def parse_coordinate_from_digits(
     digit_string: str, max_value: float, max_digits_before_decimal: int
 ) -> float:
@@ -25,9 +49,8 @@ def parse_coordinate_from_digits(
     # For rows: DDMMSS format (2 digits degrees, 2 digits minutes, 2 digits seconds)
     if max_digits_before_decimal == 2:
         if num_len >= 6:
-            degrees = int(digit_string[:2])
-            minutes = int(digit_string[2:4])
-            seconds = int(digit_string[4:6])
+            degrees, rest = divmod(int(digit_string[:6]), 10000)
+            minutes, seconds = divmod(rest, 100)
             if num_len > 6:
                 fraction = int(digit_string[6:]) / (10 ** (num_len - 6))
                 seconds += fraction
@@ -59,9 +82,8 @@ def parse_coordinate_from_digits(
         best_result = None
 
         if num_len >= 7:
-            degrees = int(digit_string[:3])
-            minutes = int(digit_string[3:5])
-            seconds = int(digit_string[5:7])
+            degrees, rest = divmod(int(digit_string[:7]), 10000)
+            minutes, seconds = divmod(rest, 100)
             if degrees < 180 and minutes < 60 and seconds < 60:
                 fraction = 0
                 if num_len > 7:
@@ -69,9 +91,8 @@ def parse_coordinate_from_digits(
                 best_result = degrees + minutes / 60.0 + (seconds + fraction) / 3600.0
 
         if best_result is None and num_len >= 6:
-            degrees = int(digit_string[:2])
-            minutes = int(digit_string[2:4])
-            seconds = int(digit_string[4:6])
+            degrees, rest = divmod(int(digit_string[:6]), 10000)
+            minutes, seconds = divmod(rest, 100)
             if degrees < 180 and minutes < 60 and seconds < 60:
                 fraction = 0
                 if num_len > 6:
@@ -82,150 +103,366 @@ def parse_coordinate_from_digits(
             return best_result
 
         if num_len == 6:
-            degrees = int(digit_string[:2])
-            minutes = int(digit_string[2:4])
-            seconds = int(digit_string[4:6])
+            degrees, rest = divmod(int(digit_string), 10000)
+            minutes, seconds = divmod(rest, 100)
             if degrees < 180 and minutes < 60 and seconds < 60:
                 return degrees + minutes / 60.0 + seconds / 3600.0
 
     return None
 
 
-def get_timezone(lat: float, lon: float) -> Tuple[str, float]:
-    """Get timezone name and GMT offset for given coordinates."""
-    tf = TimezoneFinder()
-    tz_name = tf.timezone_at(lat=lat, lng=lon)
+def parse_coordinates_from_digits(
+    digit_strings: List[str], max_value: float, max_digits_before_decimal: int
+) -> List[float]:
+    """Parse a batch of digit strings, returning None for any that fail to parse."""
+    return [
+        parse_coordinate_from_digits(digit_string, max_value, max_digits_before_decimal)
+        for digit_string in digit_strings
+    ]
+
+
+def normalize_dms(digit_string: str, max_degrees: int) -> float:
+    """Fallback DMS parse for digit strings the strict parser rejects.
+
+    Uses the last 2 digits as seconds, the next 2 as minutes and the rest as
+    degrees, carrying overflow upwards and wrapping degrees past max_degrees.
+    Returns 0.0 if there are fewer than 4 digits or the string is not numeric.
+    """
+    if len(digit_string) < 4:
+        return 0.0
+    try:
+        degrees, rest = divmod(int(digit_string), 10000)
+    except ValueError:
+        return 0.0
+    minutes, seconds = divmod(rest, 100)
+    carry, seconds = divmod(seconds, 60)
+    carry, minutes = divmod(minutes + carry, 60)
+    degrees += carry
+    if degrees > max_degrees:
+        degrees = degrees % max_degrees
+    return degrees + minutes / 60.0 + seconds / 3600.0
+
+
+@lru_cache(maxsize=1)
+def get_timezone_finder():
+    """Get the shared TimezoneFinder, loading the polygon data on first use.
+
+    Loading the timezone polygons is expensive, so build the finder once and
+    keep them in memory. On timezonefinder 6.x, installing the numba extra
+    (pip install 'timezonefinder[numba]') JIT-compiles the polygon checks;
+    later releases ship them compiled. TimezoneFinderL is deliberately not
+    used: it answers from a coarse grid and is wrong near zone borders.
+    """
+    from timezonefinder import TimezoneFinder
+
+    return TimezoneFinder(in_memory=True)
+
+
+@lru_cache(maxsize=1)
+def get_reverse_geocoder():
+    """Get the shared, rate-limited Nominatim reverse geocoder."""
+    from geopy.adapters import RequestsAdapter
+    from geopy.extra.rate_limiter import RateLimiter
+    from geopy.geocoders import Nominatim
+
+    # Shared geocoder so the underlying requests.Session keeps connections alive
+    # across lines; its pool holds one connection per worker thread
+    geolocator = Nominatim(
+        user_agent="city_finder",
+        timeout=15,
+        adapter_factory=partial(RequestsAdapter, pool_connections=1, pool_maxsize=GEOCODE_WORKERS),
+    )
+    # Nominatim's usage policy allows at most 1 request per second. Errors are
+    # raised rather than swallowed so failed lookups are not cached as misses.
+    return RateLimiter(geolocator.reverse, min_delay_seconds=1.0, swallow_exceptions=False)
+
+
+@lru_cache(maxsize=512)
+def get_utc_offset(tz_name: str, hour: int) -> float:
+    """Get GMT offset in hours for a timezone at the given hour since the epoch."""
+    import pytz
+
+    tz = pytz.timezone(tz_name)
+    offset_seconds = datetime.fromtimestamp(hour * 3600, tz).utcoffset().total_seconds()
+    return offset_seconds / 3600.0
+
+
+@lru_cache(maxsize=8192)
+def get_timezone_name(lat: float, lon: float) -> str:
+    """Get timezone name for given coordinates."""
+    return get_timezone_finder().timezone_at(lat=lat, lng=lon)
+
+
+def get_timezones(points: List[Tuple[float, float]]) -> List[Tuple[str, float]]:
+    """Get timezone name and GMT offset for each (lat, lon) point.
+
+    The clock is read once and each distinct zone's offset is looked up once.
+    """
+    tz_names = [get_timezone_name(lat, lon) for lat, lon in points]
+    hour = int(datetime.now(timezone.utc).timestamp() // 3600)
+    offsets = {tz_name: get_utc_offset(tz_name, hour) for tz_name in set(tz_names) if tz_name}
+    return [(tz_name, offsets.get(tz_name)) for tz_name in tz_names]
+
+
+@lru_cache(maxsize=1024)
+def ruler_coefficients(lat: float) -> Tuple[float, float]:
+    """Get km per degree of longitude and latitude near the given latitude.
+
+    Port of Mapbox's cheap-ruler: a flat-earth approximation that stays
+    within ~0.1% of the ellipsoidal distance for spans of a few hundred km.
+    """
+    km_per_degree = math.radians(1) * WGS84_RADIUS_KM
+    cos_lat = math.cos(math.radians(lat))
+    w2 = 1 / (1 - WGS84_E2 * (1 - cos_lat * cos_lat))
+    w = math.sqrt(w2)
+    kx = km_per_degree * w * cos_lat
+    ky = km_per_degree * w * w2 * (1 - WGS84_E2)
+    return kx, ky
+
+
+def ruler_distance_km(
+    kx: float, ky: float, lat1: float, lon1: float, lat2: float, lon2: float
+) -> float:
+    """Distance in km between two points using precomputed ruler coefficients."""
+    dlon = lon2 - lon1
+    if abs(dlon) > 180:
+        dlon -= math.copysign(360, dlon)
+    dx = dlon * kx
+    dy = (lat2 - lat1) * ky
+    return math.sqrt(dx * dx + dy * dy)
+
+
+@lru_cache(maxsize=4096)
+def reverse_geocode_cell(lat: float, lon: float):
+    """Reverse geocode a 0.1° grid cell, using the on-disk cache when possible."""
+    key = f"{lat:.1f},{lon:.1f}"
+    with geocache_lock:
+        with shelve.open(GEOCACHE_FILE) as cache:
+            cached = key in cache
+            raw = cache.get(key)
+
+    if not cached:
+        location = get_reverse_geocoder()((lat, lon), exactly_one=True)
+        raw = location.raw if location else None
+        with geocache_lock:
+            with shelve.open(GEOCACHE_FILE) as cache:
+                cache[key] = raw
+
+    if raw is None:
+        return None
+
+    from geopy.location import Location
+
+    return Location(raw.get("display_name"), (float(raw["lat"]), float(raw["lon"])), raw)
+
+
+def reverse_geocode_point(point: Tuple[float, float]):
+    """Reverse geocode a (lat, lon) point, returning None for ocean or on error."""
+    lat, lon = round(point[0], 1), round(point[1], 1)
+    # Open ocean has no land timezone and nothing for Nominatim to find,
+    # so skip the HTTP round trip for it
+    if get_timezone_finder().timezone_at_land(lat=lat, lng=lon) is None:
+        return None
+    try:
+        return reverse_geocode_cell(lat, lon)
+    except Exception:
+        return None
+
+
+def reverse_geocode_points(points: List[Tuple[float, float]]) -> List:
+    """Reverse geocode (lat, lon) points concurrently, preserving input order."""
+    locations = []
+    for location in geocode_executor.map(reverse_geocode_point, points):
+        locations.append(location)
+        print(".", end="", flush=True)
+    return locations
 
-    if tz_name:
-        tz = pytz.timezone(tz_name)
-        now = datetime.now(tz)
-        offset_seconds = now.utcoffset().total_seconds()
-        offset_hours = offset_seconds / 3600.0
-        return tz_name, offset_hours
-    return None, None
 
+def city_name_from_address(address: Dict) -> str:
+    """Pick the most specific place name from a Nominatim address."""
+    return (
+        address.get("city")
+        or address.get("town")
+        or address.get("village")
+        or address.get("municipality")
+        or address.get("county")
+        or address.get("state")
+        or address.get("country")
+    )
 
-def find_cities_along_line(fixed_coord: float, is_latitude: bool, num_points: int = 10) -> List[Dict]:
+
+def sample_grid(start: float, stop: float, num_points: int) -> List[float]:
+    """Evenly spaced sample positions from start to stop inclusive."""
+    return [start + (stop - start) * i / (num_points - 1) for i in range(num_points)]
+
+
+def find_cities_along_line(fixed_coord: float, is_latitude: bool, grid: List[float]) -> List[Dict]:
     """Find cities along a latitude or longitude line.
     
     Args:
         fixed_coord: The fixed latitude or longitude value
         is_latitude: True if fixed_coord is latitude (search along longitude), False if longitude (search along latitude)
-        num_points: Number of points to sample along the line
+        grid: Positions to sample along the line (longitudes for a latitude line, latitudes otherwise)
     """
-    geolocator = Nominatim(user_agent="city_finder")
+    if is_latitude:
+        # Search along longitude (latitude is fixed)
+        points = [(fixed_coord, lon) for lon in grid]
+    else:
+        # Search along latitude (longitude is fixed)
+        points = [(lat, fixed_coord) for lat in grid]
+
     cities = []
     seen_cities = set()
 
     try:
-        if is_latitude:
-            # Search along longitude (latitude is fixed)
-            # Sample points from -180 to 180 longitude, focusing on populated areas
-            # Skip ocean areas by sampling more densely in mid-latitudes
-            sample_lons = []
-            # Create strategic sampling: more points in populated regions
-            for i in range(num_points):
-                lon = -180 + (360 * i / (num_points - 1))
-                if abs(lon) > 180:
-                    lon = 180 if lon > 180 else -180
-                sample_lons.append(lon)
-            
-            print(f"    Sampling {len(sample_lons)} points...", end="", flush=True)
-            
-            for i, lon in enumerate(sample_lons):
-                try:
-                    location = geolocator.reverse((fixed_coord, lon), timeout=5, exactly_one=True)
-                    if location:
-                        address = location.raw.get("address", {})
-                        city_name = (
-                            address.get("city")
-                            or address.get("town")
-                            or address.get("village")
-                            or address.get("municipality")
-                            or address.get("county")
-                            or address.get("state")
-                            or address.get("country")
-                        )
-                        if city_name and city_name not in seen_cities:
-                            seen_cities.add(city_name)
-                            city_lat = location.latitude
-                            city_lon = location.longitude
-                            # Distance from the line (for latitude line, measure longitude difference)
-                            lon_diff = abs(city_lon - lon)
-                            if lon_diff > 180:
-                                lon_diff = 360 - lon_diff
-                            distance = lon_diff * 111.0 * abs(fixed_coord / 90.0) if abs(fixed_coord) < 90 else lon_diff * 111.0
-                            tz_name, offset = get_timezone(city_lat, city_lon)
-                            cities.append({
-                                "name": city_name,
-                                "lat": city_lat,
-                                "lon": city_lon,
-                                "distance": distance,
-                                "timezone": tz_name,
-                                "offset": offset,
-                                "address": location.address
-                            })
-                except Exception as e:
-                    pass
-                
-                print(".", end="", flush=True)
-                time.sleep(0.5)  # Be respectful to API
-            print()  # New line after progress dots
-        else:
-            # Search along latitude (longitude is fixed)
-            # Sample points from -90 to 90 latitude
-            sample_lats = []
-            for i in range(num_points):
-                lat = -90 + (180 * i / (num_points - 1))
-                if abs(lat) > 90:
-                    lat = 90 if lat > 90 else -90
-                sample_lats.append(lat)
-            
-            print(f"    Sampling {len(sample_lats)} points...", end="", flush=True)
-            
-            for i, lat in enumerate(sample_lats):
-                try:
-                    location = geolocator.reverse((lat, fixed_coord), timeout=5, exactly_one=True)
-                    if location:
-                        address = location.raw.get("address", {})
-                        city_name = (
-                            address.get("city")
-                            or address.get("town")
-                            or address.get("village")
-                            or address.get("municipality")
-                            or address.get("county")
-                            or address.get("state")
-                            or address.get("country")
-                        )
-                        if city_name and city_name not in seen_cities:
-                            seen_cities.add(city_name)
-                            city_lat = location.latitude
-                            city_lon = location.longitude
-                            # Distance from the line (for longitude line, measure latitude difference)
-                            distance = abs(city_lat - lat) * 111.0
-                            tz_name, offset = get_timezone(city_lat, city_lon)
-                            cities.append({
-                                "name": city_name,
-                                "lat": city_lat,
-                                "lon": city_lon,
-                                "distance": distance,
-                                "timezone": tz_name,
-                                "offset": offset,
-                                "address": location.address
-                            })
-                except Exception as e:
-                    pass
-                
-                print(".", end="", flush=True)
-                time.sleep(0.5)  # Be respectful to API
-            print()  # New line after progress dots
+        print(f"    Sampling {len(points)} points...", end="", flush=True)
+        locations = reverse_geocode_points(points)
+
+        for (lat, lon), location in zip(points, locations):
+            try:
+                if location:
+                    city_name = city_name_from_address(location.raw.get("address", {}))
+                    if city_name and city_name not in seen_cities:
+                        seen_cities.add(city_name)
+                        city_lat = location.latitude
+                        city_lon = location.longitude
+                        # Distance from the sampled point on the line
+                        kx, ky = ruler_coefficients(lat)
+                        distance = ruler_distance_km(kx, ky, lat, lon, city_lat, city_lon)
+                        cities.append({
+                            "name": city_name,
+                            "lat": city_lat,
+                            "lon": city_lon,
+                            "distance": distance,
+                            "address": location.address
+                        })
+            except Exception as e:
+                pass
+        print()  # New line after progress dots
 
     except Exception as e:
         print(f"\n  Error finding cities: {e}")
 
-    # Sort by distance and return top 3
-    cities.sort(key=lambda x: x["distance"])
-    return cities[:3]
+    # Keep the 3 closest without sorting every candidate
+    cities = heapq.nsmallest(3, cities, key=lambda x: x["distance"])
+
+    # Only the returned cities need timezone information
+    timezones = get_timezones([(city["lat"], city["lon"]) for city in cities])
+    for city, (tz_name, offset) in zip(cities, timezones):
+        city["timezone"] = tz_name
+        city["offset"] = offset
+    return cities
+
+
+MAP_HEADER = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css"/>
+<link rel="stylesheet" href="https://netdna.bootstrapcdn.com/bootstrap/3.0.0/css/bootstrap-glyphicons.css"/>
+<link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/Leaflet.awesome-markers/2.0.2/leaflet.awesome-markers.css"/>
+<script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
+<script src="https://cdnjs.cloudflare.com/ajax/libs/Leaflet.awesome-markers/2.0.2/leaflet.awesome-markers.js"></script>
+<style>html, body, #map { width: 100%; height: 100%; margin: 0; padding: 0; }</style>
+</head>
+<body>
+<div id="map"></div>
+<div style="position: fixed; 
+            bottom: 50px; left: 50px; width: 250px; height: 200px; 
+            background-color: white; z-index:9999; font-size:14px;
+            border:2px solid grey; border-radius:5px; padding: 10px">
+<p><b>Legend</b></p>
+<p><b>Latitude Lines:</b></p>
+<p style="color:red">━━━ Red lines (from rows)</p>
+<p><b>Longitude Lines:</b></p>
+<p style="color:blue">━━━ Blue lines (from columns)</p>
+<p><b>Cities:</b></p>
+<p>🟢 Dark Green = Rank 1</p>
+<p>🟢 Green = Rank 2</p>
+<p>🟢 Light Green = Rank 3</p>
+</div>
+<script>
+"""
+
+MAP_FOOTER = """</script>
+</body>
+</html>
+"""
+
+# Color scheme for latitude lines (red tones) and longitude lines (blue tones)
+LAT_COLORS = ['red', 'darkred', 'crimson', 'firebrick', 'indianred', 'lightcoral',
+              'salmon', 'tomato', 'orangered', 'chocolate', 'sienna', 'maroon']
+LON_COLORS = ['blue', 'darkblue', 'navy', 'mediumblue', 'royalblue', 'steelblue',
+              'cornflowerblue', 'skyblue', 'lightblue', 'dodgerblue', 'deepskyblue', 'cyan']
+
+
+def render_map(sections: List[Dict], output_file: str) -> None:
+    """Write a Leaflet map of the line sections and their cities as a standalone HTML file.
+
+    The HTML is streamed straight to disk in a single pass over the data
+    rather than built up as a folium object tree.
+    """
+    # Calculate center from all cities
+    all_lats = [city["lat"] for data in sections for city in data["cities"]]
+    all_lons = [city["lon"] for data in sections for city in data["cities"]]
+    if all_lats and all_lons:
+        avg_lat = sum(all_lats) / len(all_lats)
+        avg_lon = sum(all_lons) / len(all_lons)
+    else:
+        avg_lat, avg_lon = 0, 0
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(MAP_HEADER)
+        f.write(f"var map = L.map('map').setView([{avg_lat}, {avg_lon}], 2);\n")
+        f.write(
+            "L.tileLayer('https://tile.openstreetmap.org/{z}/{x}/{y}.png', "
+            "{maxZoom: 19, attribution: '&copy; "
+            "<a href=\"https://www.openstreetmap.org/copyright\">OpenStreetMap</a> contributors'})"
+            ".addTo(map);\n"
+        )
+
+        for data in sections:
+            index = data["index"]
+            fixed_coord = data["fixed_coord"]
+            label = data["label"]
+
+            if data["type"] == "latitude":
+                color = LAT_COLORS[(index - 1) % len(LAT_COLORS)]
+                line_coords = [[fixed_coord, -180], [fixed_coord, 180]]
+                line_popup = f"Latitude Line {index}: {fixed_coord:+.6f}°"
+            else:  # longitude
+                color = LON_COLORS[(index - 1) % len(LON_COLORS)]
+                line_coords = [[-90, fixed_coord], [90, fixed_coord]]
+                line_popup = f"Longitude Line {index}: {fixed_coord:+.6f}°"
+            f.write(
+                f"L.polyline({json.dumps(line_coords)}, "
+                f"{{color: '{color}', weight: 2, opacity: 0.5}})"
+                f".bindPopup({json.dumps(line_popup)}).addTo(map);\n"
+            )
+
+            # Mark each city
+            for i, city in enumerate(data["cities"]):
+                marker_color = 'darkgreen' if i == 0 else 'green' if i == 1 else 'lightgreen'
+                offset = f"{city['offset']:+.2f}" if city['offset'] is not None else "N/A"
+                popup_text = (
+                    f"<b>{city['name']}</b><br>"
+                    f"{label}, Rank {i+1}<br>"
+                    f"Distance from line: {city['distance']:.2f} km<br>"
+                    f"Timezone: {city['timezone']}<br>"
+                    f"GMT Offset: {offset} hours<br>"
+                    f"Coordinates: ({city['lat']:.6f}, {city['lon']:.6f})"
+                )
+                tooltip = f"{label}: {city['name']} ({city['timezone']})"
+                f.write(
+                    f"L.marker([{city['lat']}, {city['lon']}], "
+                    f"{{icon: L.AwesomeMarkers.icon({{icon: 'info-sign', prefix: 'glyphicon', "
+                    f"markerColor: '{marker_color}'}})}})"
+                    f".bindPopup({json.dumps(popup_text)}, {{maxWidth: 300}})"
+                    f".bindTooltip({json.dumps(tooltip)}).addTo(map);\n"
+                )
+
+        f.write(MAP_FOOTER)
 
 
 def main():
@@ -250,11 +487,8 @@ def main():
 
     # Extract columns
     column_lines = lines[:separator_idx]
-    cleaned_column_lines = []
-    for line in column_lines:
-        cleaned = line.replace("_", "").strip()
-        if cleaned:
-            cleaned_column_lines.append(cleaned)
+    cleaned_column_lines = [line.translate(DIGIT_CLEANUP) for line in column_lines]
+    cleaned_column_lines = [line for line in cleaned_column_lines if line]
 
     # Read offsets
     column_signs = []
@@ -270,80 +504,29 @@ def main():
         print("Warning: offests.txt not found")
 
     # Extract columns - get all 12 columns
+    # Transpose the cleaned lines; a line too short for a column adds no digit to it
+    column_strings = ["".join(chars) for chars in zip_longest(*cleaned_column_lines, fillvalue="")][:12]
+
     columns = []
-    for col_idx in range(12):
-        col_digits = []
-        for cleaned_line in cleaned_column_lines:
-            if col_idx < len(cleaned_line):
-                col_digits.append(cleaned_line[col_idx])
-        if col_digits:
-            digit_string = "".join(col_digits)
-            coord = parse_coordinate_from_digits(digit_string, 180.0, 3)
-            if coord is not None:
-                columns.append((digit_string, abs(coord)))
-            else:
-                # Even if parsing fails, keep the column with a placeholder
-                # Try to extract a reasonable coordinate value
-                # Use last 2 digits as seconds, next 2 as minutes, rest as degrees
-                if len(digit_string) >= 4:
-                    try:
-                        seconds = int(digit_string[-2:])
-                        minutes = int(digit_string[-4:-2])
-                        degrees = int(digit_string[:-4]) if len(digit_string) > 4 else 0
-                        # Normalize if seconds >= 60
-                        if seconds >= 60:
-                            minutes += seconds // 60
-                            seconds = seconds % 60
-                        # Normalize if minutes >= 60
-                        if minutes >= 60:
-                            degrees += minutes // 60
-                            minutes = minutes % 60
-                        # Cap degrees at 180
-                        if degrees > 180:
-                            degrees = degrees % 180
-                        coord = degrees + minutes/60.0 + seconds/3600.0
-                        columns.append((digit_string, abs(coord)))
-                    except:
-                        # If all else fails, use a default value
-                        columns.append((digit_string, 0.0))
-                else:
-                    columns.append((digit_string, 0.0))
+    column_coords = parse_coordinates_from_digits(column_strings, 180.0, 3)
+    for digit_string, coord in zip(column_strings, column_coords):
+        if coord is None:
+            # Even if parsing fails, keep the column with a placeholder
+            coord = normalize_dms(digit_string, 180)
+        columns.append((digit_string, abs(coord)))
 
     # Extract rows - get all 12 rows
     row_lines = lines[separator_idx + 1 :]
+    row_strings = [line.translate(DIGIT_CLEANUP) for line in row_lines]
+    row_strings = [line for line in row_strings if line]
+
     rows = []
-    for row_idx, line in enumerate(row_lines):
-        if line.strip():
-            cleaned = line.replace("_", "").strip()
-            if cleaned:
-                coord = parse_coordinate_from_digits(cleaned, 90.0, 2)
-                if coord is not None:
-                    rows.append((cleaned, abs(coord)))
-                else:
-                    # Even if parsing fails, keep the row with a placeholder
-                    # Try to extract a reasonable coordinate value
-                    if len(cleaned) >= 4:
-                        try:
-                            seconds = int(cleaned[-2:])
-                            minutes = int(cleaned[-4:-2])
-                            degrees = int(cleaned[:-4]) if len(cleaned) > 4 else 0
-                            # Normalize if seconds >= 60
-                            if seconds >= 60:
-                                minutes += seconds // 60
-                                seconds = seconds % 60
-                            # Normalize if minutes >= 60
-                            if minutes >= 60:
-                                degrees += minutes // 60
-                                minutes = minutes % 60
-                            # Cap degrees at 90
-                            if degrees > 90:
-                                degrees = degrees % 90
-                            coord = degrees + minutes/60.0 + seconds/3600.0
-                            rows.append((cleaned, abs(coord)))
-                        except:
-                            rows.append((cleaned, 0.0))
-                    else:
-                        rows.append((cleaned, 0.0))
+    row_coords = parse_coordinates_from_digits(row_strings, 90.0, 2)
+    for cleaned, coord in zip(row_strings, row_coords):
+        if coord is None:
+            # Even if parsing fails, keep the row with a placeholder
+            coord = normalize_dms(cleaned, 90)
+        rows.append((cleaned, abs(coord)))
     # Ensure we have exactly 12 rows
     while len(rows) < 12:
         rows.append(("000000", 0.0))
@@ -359,6 +542,14 @@ def main():
 
     all_sections_data = []
 
+    # Sample positions are the same for every line, so build them once
+    lon_grid = sample_grid(-180, 180, 20)
+    lat_grid = sample_grid(-90, 90, 20)
+
+    # Load the timezone data and geocoder before the worker threads need them
+    get_timezone_finder()
+    get_reverse_geocoder()
+
     # Process latitude lines (from rows)
     print("\n=== LATITUDE LINES (from rows) ===\n")
     for idx, (row_str, row_val) in enumerate(rows):
@@ -375,7 +566,7 @@ def main():
         print(f"  Finding cities along this latitude...")
 
         # Find cities along this latitude line
-        cities = find_cities_along_line(lat_val, is_latitude=True, num_points=20)
+        cities = find_cities_along_line(lat_val, is_latitude=True, grid=lon_grid)
         
         if cities:
             print(f"  Top {len(cities)} cities/regions:")
@@ -414,7 +605,7 @@ def main():
         print(f"  Finding cities along this longitude...")
 
         # Find cities along this longitude line
-        cities = find_cities_along_line(lon_val, is_latitude=False, num_points=20)
+        cities = find_cities_along_line(lon_val, is_latitude=False, grid=lat_grid)
         
         if cities:
             print(f"  Top {len(cities)} cities/regions:")
@@ -440,100 +631,10 @@ def main():
     # Create map
     if all_sections_data:
         print("\nCreating map visualization...")
-        
-        # Calculate center from all cities
-        all_lats = []
-        all_lons = []
-        for data in all_sections_data:
-            for city in data["cities"]:
-                all_lats.append(city["lat"])
-                all_lons.append(city["lon"])
-        
-        if all_lats and all_lons:
-            avg_lat = sum(all_lats) / len(all_lats)
-            avg_lon = sum(all_lons) / len(all_lons)
-        else:
-            avg_lat, avg_lon = 0, 0
-
-        m = folium.Map(location=[avg_lat, avg_lon], zoom_start=2)
-
-        # Color scheme for latitude lines (red tones) and longitude lines (blue tones)
-        lat_colors = ['red', 'darkred', 'crimson', 'firebrick', 'indianred', 'lightcoral', 
-                      'salmon', 'tomato', 'orangered', 'chocolate', 'sienna', 'maroon']
-        lon_colors = ['blue', 'darkblue', 'navy', 'mediumblue', 'royalblue', 'steelblue',
-                      'cornflowerblue', 'skyblue', 'lightblue', 'dodgerblue', 'deepskyblue', 'cyan']
-
-        for data in all_sections_data:
-            section_type = data["type"]
-            index = data["index"]
-            fixed_coord = data["fixed_coord"]
-            label = data["label"]
-            cities = data["cities"]
-            
-            if section_type == "latitude":
-                color = lat_colors[(index - 1) % len(lat_colors)]
-                # Draw latitude line
-                line_coords = [[fixed_coord, -180], [fixed_coord, 180]]
-                folium.PolyLine(
-                    line_coords,
-                    color=color,
-                    weight=2,
-                    opacity=0.5,
-                    popup=f"Latitude Line {index}: {fixed_coord:+.6f}°"
-                ).add_to(m)
-            else:  # longitude
-                color = lon_colors[(index - 1) % len(lon_colors)]
-                # Draw longitude line
-                line_coords = [[-90, fixed_coord], [90, fixed_coord]]
-                folium.PolyLine(
-                    line_coords,
-                    color=color,
-                    weight=2,
-                    opacity=0.5,
-                    popup=f"Longitude Line {index}: {fixed_coord:+.6f}°"
-                ).add_to(m)
-
-            # Mark each city
-            for i, city in enumerate(cities):
-                marker_color = 'darkgreen' if i == 0 else 'green' if i == 1 else 'lightgreen'
-                popup_text = f"""
-                <b>{city['name']}</b><br>
-                {label}, Rank {i+1}<br>
-                Distance from line: {city['distance']:.2f} km<br>
-                Timezone: {city['timezone']}<br>
-                GMT Offset: {city['offset']:+.2f} hours<br>
-                Coordinates: ({city['lat']:.6f}, {city['lon']:.6f})
-                """
-                
-                folium.Marker(
-                    location=[city['lat'], city['lon']],
-                    popup=folium.Popup(popup_text, max_width=300),
-                    icon=folium.Icon(color=marker_color, icon='info-sign'),
-                    tooltip=f"{label}: {city['name']} ({city['timezone']})"
-                ).add_to(m)
-
-        # Add legend
-        legend_html = """
-        <div style="position: fixed; 
-                    bottom: 50px; left: 50px; width: 250px; height: 200px; 
-                    background-color: white; z-index:9999; font-size:14px;
-                    border:2px solid grey; border-radius:5px; padding: 10px">
-        <p><b>Legend</b></p>
-        <p><b>Latitude Lines:</b></p>
-        <p style="color:red">━━━ Red lines (from rows)</p>
-        <p><b>Longitude Lines:</b></p>
-        <p style="color:blue">━━━ Blue lines (from columns)</p>
-        <p><b>Cities:</b></p>
-        <p>🟢 Dark Green = Rank 1</p>
-        <p>🟢 Green = Rank 2</p>
-        <p>🟢 Light Green = Rank 3</p>
-        </div>
-        """
-        m.get_root().html.add_child(folium.Element(legend_html))
 
         # Save map
         output_file = "cities_map.html"
-        m.save(output_file)
+        render_map(all_sections_data, output_file)
         print(f"Map saved to: {output_file}")
         print(f"Open {output_file} in your web browser to view the map")
         print(f"\nTotal sections: {len(all_sections_data)} (12 latitude + {len(columns)} longitude lines)")
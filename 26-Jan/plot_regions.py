@@ -4,24 +4,16 @@ Plot locations from Regions.txt on a world map with timezone information.
 """
 
 import sys
+import json
 from typing import List, Dict, Tuple
-from timezonefinder import TimezoneFinder
-import pytz
-from datetime import datetime
-import folium
-
-try:
-    import folium
-    folium_available = True
-except ImportError:
-    folium_available = False
-    print("Warning: folium not available. Install with: pip install folium", file=sys.stderr)
-
-try:
-    import pytz
-    pytz_available = True
-except ImportError:
-    pytz_available = False
+from functools import lru_cache
+from importlib.util import find_spec
+from datetime import datetime, timezone
+
+# timezonefinder and pytz are imported where they are first used so that the
+# script starts quickly and fails fast when Regions.txt is missing
+pytz_available = find_spec("pytz") is not None
+if not pytz_available:
     print("Warning: pytz not available. Install with: pip install pytz", file=sys.stderr)
 
 
@@ -39,20 +31,44 @@ def format_dms(degrees: int, minutes: int, seconds: float) -> str:
     return f"{degrees}° {minutes}' {seconds:.2f}\""
 
 
-def get_timezone(lat: float, lon: float) -> Tuple[str, float]:
-    """Get timezone name and GMT offset for given coordinates."""
-    tf = TimezoneFinder()
-    tz_name = tf.timezone_at(lat=lat, lng=lon)
+@lru_cache(maxsize=1)
+def get_timezone_finder():
+    """Get the shared TimezoneFinder, loading the polygon data on first use.
+
+    Loading the timezone polygons is expensive, so build the finder once and
+    keep them in memory. On timezonefinder 6.x, installing the numba extra
+    (pip install 'timezonefinder[numba]') JIT-compiles the polygon checks;
+    later releases ship them compiled. TimezoneFinderL is deliberately not
+    used: it answers from a coarse grid and is wrong near zone borders.
+    """
+    from timezonefinder import TimezoneFinder
+
+    return TimezoneFinder(in_memory=True)
+
+
+@lru_cache(maxsize=512)
+def get_utc_offset(tz_name: str, hour: int) -> float:
+    """Get GMT offset in hours for a timezone at the given hour since the epoch."""
+    import pytz
+
+    tz = pytz.timezone(tz_name)
+    offset_seconds = datetime.fromtimestamp(hour * 3600, tz).utcoffset().total_seconds()
+    return offset_seconds / 3600.0
 
-    if tz_name and pytz_available:
-        tz = pytz.timezone(tz_name)
-        now = datetime.now(tz)
-        offset_seconds = now.utcoffset().total_seconds()
-        offset_hours = offset_seconds / 3600.0
-        return tz_name, offset_hours
-    elif tz_name:
-        return tz_name, None
-    return None, None
+
+def get_timezones(points: List[Tuple[float, float]]) -> List[Tuple[str, float]]:
+    """Get timezone name and GMT offset for each (lat, lon) point.
+
+    The clock is read once and each distinct zone's offset is looked up once.
+    """
+    timezone_at = get_timezone_finder().timezone_at
+    tz_names = [timezone_at(lat=lat, lng=lon) for lat, lon in points]
+    if not pytz_available:
+        return [(tz_name, None) for tz_name in tz_names]
+
+    hour = int(datetime.now(timezone.utc).timestamp() // 3600)
+    offsets = {tz_name: get_utc_offset(tz_name, hour) for tz_name in set(tz_names) if tz_name}
+    return [(tz_name, offsets.get(tz_name)) for tz_name in tz_names]
 
 
 def parse_coordinate(coord_str: str) -> float:
@@ -79,6 +95,81 @@ def parse_coordinate(coord_str: str) -> float:
     
     return None
 
+MAP_HEADER = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css"/>
+<script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
+<style>html, body, #map { width: 100%; height: 100%; margin: 0; padding: 0; }</style>
+</head>
+<body>
+<div id="map"></div>
+<script>
+"""
+
+MAP_FOOTER = """</script>
+</body>
+</html>
+"""
+
+# Color scheme
+COLORS = ['red', 'blue', 'green', 'purple', 'orange', 'darkred', 'lightred',
+          'beige', 'darkblue', 'darkgreen', 'cadetblue', 'darkpurple',
+          'pink', 'lightblue', 'lightgreen', 'gray', 'black', 'white',
+          'lightgray', 'darkgray', 'yellow', 'cyan', 'magenta', 'lime']
+
+
+def render_map(locations: List[Dict], output_file: str) -> None:
+    """Write a Leaflet map of the locations as a standalone HTML file.
+
+    The HTML is streamed straight to disk in a single pass over the data
+    rather than built up as a folium object tree.
+    """
+    # Calculate center
+    avg_lat = sum(loc["lat"] for loc in locations) / len(locations)
+    avg_lon = sum(loc["lon"] for loc in locations) / len(locations)
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(MAP_HEADER)
+        f.write(f"var map = L.map('map').setView([{avg_lat}, {avg_lon}], 2);\n")
+        f.write(
+            "L.tileLayer('https://tile.openstreetmap.org/{z}/{x}/{y}.png', "
+            "{maxZoom: 19, attribution: '&copy; "
+            "<a href=\"https://www.openstreetmap.org/copyright\">OpenStreetMap</a> contributors'})"
+            ".addTo(map);\n"
+        )
+
+        # Add markers for each location
+        for i, loc in enumerate(locations):
+            color = COLORS[i % len(COLORS)]
+
+            popup_text = (
+                f"<b>{loc['name']}</b><br>"
+                f"Coordinates: {loc['dms']}<br>"
+                f"Decimal: ({loc['lat']:.6f}, {loc['lon']:.6f})<br>"
+            )
+            if loc['timezone']:
+                popup_text += f"Timezone: {loc['timezone']}<br>"
+                if loc['offset'] is not None:
+                    popup_text += f"GMT Offset: {loc['offset']:+.2f} hours"
+                else:
+                    popup_text += "GMT Offset: N/A"
+            else:
+                popup_text += "Timezone: Not found"
+            tooltip = f"{loc['name']} ({loc['timezone'] or 'No timezone'})"
+
+            f.write(
+                f"L.circleMarker([{loc['lat']}, {loc['lon']}], "
+                f"{{radius: 10, color: '{color}', fill: true, fillColor: '{color}', "
+                f"fillOpacity: 0.7, weight: 2}})"
+                f".bindPopup({json.dumps(popup_text)}, {{maxWidth: 300}})"
+                f".bindTooltip({json.dumps(tooltip)}).addTo(map);\n"
+            )
+
+        f.write(MAP_FOOTER)
+
 
 def main():
     # Read Regions.txt
@@ -96,9 +187,9 @@ def main():
     print(f"Reading {len(lines)} locations from Regions.txt...")
     print("=" * 80)
 
-    locations = []
-    all_lats = []
-    all_lons = []
+    # Parse every line first so the timezone lookups can be done as one batch
+    # Each entry is (idx, name, lat, lon, error message or None)
+    entries = []
 
     # Parse each line - assume format: name, latitude, longitude (or similar)
     for idx, line in enumerate(lines, 1):
@@ -118,102 +209,63 @@ def main():
             
             if lat is not None and lon is not None:
                 if abs(lat) <= 90 and abs(lon) <= 180:
-                    tz_name, offset = get_timezone(lat, lon)
-                    
-                    lat_d, lat_m, lat_s = decimal_to_dms(abs(lat))
-                    lon_d, lon_m, lon_s = decimal_to_dms(abs(lon))
-                    lat_dir = "N" if lat >= 0 else "S"
-                    lon_dir = "E" if lon >= 0 else "W"
-                    
-                    locations.append({
-                        "name": name,
-                        "lat": lat,
-                        "lon": lon,
-                        "timezone": tz_name,
-                        "offset": offset,
-                        "dms": f"{format_dms(lat_d, lat_m, lat_s)} {lat_dir}, {format_dms(lon_d, lon_m, lon_s)} {lon_dir}"
-                    })
-                    
-                    all_lats.append(lat)
-                    all_lons.append(lon)
-                    
-                    print(f"{idx}. {name}")
-                    print(f"   Coordinates: {format_dms(lat_d, lat_m, lat_s)} {lat_dir}, {format_dms(lon_d, lon_m, lon_s)} {lon_dir}")
-                    print(f"   (Decimal: {lat:.6f}, {lon:.6f})")
-                    if tz_name:
-                        print(f"   Timezone: {tz_name}")
-                        if offset is not None:
-                            print(f"   GMT Offset: {offset:+.2f} hours")
-                    print()
+                    entries.append((idx, name, lat, lon, None))
                 else:
-                    print(f"{idx}. {name} - Invalid coordinates: ({lat}, {lon})")
-                    print()
+                    entries.append((idx, name, lat, lon, f"{idx}. {name} - Invalid coordinates: ({lat}, {lon})"))
             else:
-                print(f"{idx}. {name} - Could not parse coordinates: {lat_str}, {lon_str}")
-                print()
+                entries.append((idx, name, lat, lon, f"{idx}. {name} - Could not parse coordinates: {lat_str}, {lon_str}"))
         else:
-            print(f"{idx}. Line format unclear: {line}")
+            entries.append((idx, None, None, None, f"{idx}. Line format unclear: {line}"))
+
+    valid_points = [(lat, lon) for _, _, lat, lon, error in entries if error is None]
+    timezones = iter(get_timezones(valid_points))
+
+    locations = []
+    for idx, name, lat, lon, error in entries:
+        if error:
+            print(error)
             print()
+            continue
 
-    if not locations:
-        print("No valid locations found to plot")
-        return
+        tz_name, offset = next(timezones)
 
-    # Create map
-    if folium_available:
-        print("Creating map visualization...")
-        
-        # Calculate center
-        avg_lat = sum(all_lats) / len(all_lats)
-        avg_lon = sum(all_lons) / len(all_lons)
+        lat_d, lat_m, lat_s = decimal_to_dms(abs(lat))
+        lon_d, lon_m, lon_s = decimal_to_dms(abs(lon))
+        lat_dir = "N" if lat >= 0 else "S"
+        lon_dir = "E" if lon >= 0 else "W"
+        dms = f"{format_dms(lat_d, lat_m, lat_s)} {lat_dir}, {format_dms(lon_d, lon_m, lon_s)} {lon_dir}"
 
-        m = folium.Map(location=[avg_lat, avg_lon], zoom_start=2)
+        locations.append({
+            "name": name,
+            "lat": lat,
+            "lon": lon,
+            "timezone": tz_name,
+            "offset": offset,
+            "dms": dms
+        })
 
-        # Color scheme
-        colors = ['red', 'blue', 'green', 'purple', 'orange', 'darkred', 'lightred', 
-                  'beige', 'darkblue', 'darkgreen', 'cadetblue', 'darkpurple',
-                  'pink', 'lightblue', 'lightgreen', 'gray', 'black', 'white',
-                  'lightgray', 'darkgray', 'yellow', 'cyan', 'magenta', 'lime']
+        print(f"{idx}. {name}")
+        print(f"   Coordinates: {dms}")
+        print(f"   (Decimal: {lat:.6f}, {lon:.6f})")
+        if tz_name:
+            print(f"   Timezone: {tz_name}")
+            if offset is not None:
+                print(f"   GMT Offset: {offset:+.2f} hours")
+        print()
 
-        # Add markers for each location
-        for i, loc in enumerate(locations):
-            color = colors[i % len(colors)]
-            
-            popup_text = f"""
-            <b>{loc['name']}</b><br>
-            Coordinates: {loc['dms']}<br>
-            Decimal: ({loc['lat']:.6f}, {loc['lon']:.6f})<br>
-            """
-            if loc['timezone']:
-                popup_text += f"Timezone: {loc['timezone']}<br>"
-                if loc['offset'] is not None:
-                    popup_text += f"GMT Offset: {loc['offset']:+.2f} hours"
-                else:
-                    popup_text += "GMT Offset: N/A"
-            else:
-                popup_text += "Timezone: Not found"
+    if not locations:
+        print("No valid locations found to plot")
+        return
 
-            folium.CircleMarker(
-                location=[loc['lat'], loc['lon']],
-                radius=10,
-                popup=folium.Popup(popup_text, max_width=300),
-                color=color,
-                fill=True,
-                fillColor=color,
-                fillOpacity=0.7,
-                weight=2,
-                tooltip=f"{loc['name']} ({loc['timezone'] or 'No timezone'})"
-            ).add_to(m)
-
-        # Save map
-        output_file = "regions_map.html"
-        m.save(output_file)
-        print(f"Map saved to: {output_file}")
-        print(f"Open {output_file} in your web browser to view the map")
-        print(f"\nTotal locations plotted: {len(locations)}")
-    else:
-        print("Note: Install folium to generate map visualization: pip install folium")
+    # Create map
+    print("Creating map visualization...")
 
+    # Save map
+    output_file = "regions_map.html"
+    render_map(locations, output_file)
+    print(f"Map saved to: {output_file}")
+    print(f"Open {output_file} in your web browser to view the map")
+    print(f"\nTotal locations plotted: {len(locations)}")
 
 if __name__ == "__main__":
     main()
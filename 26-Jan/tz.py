@@ -3,24 +3,36 @@
 Parse coordinates from the data file and get timezone information for each point.
 """
 
-import re
 import sys
 import time
+import shelve
+from functools import lru_cache
 from typing import List, Tuple
 from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+from pathlib import Path
+from importlib import metadata
+from importlib.util import find_spec
 
 
 def decimal_to_dms(decimal_degrees: float) -> Tuple[int, int, float]:
     """Convert decimal degrees to degrees, minutes, seconds.
 
+    The angle is rounded to hundredths of an arcsecond, the precision
+    format_dms prints, and split with integer divmod. Seconds that round
+    up to 60 carry into the minutes instead of printing as 60.00.
+
     Returns:
         Tuple of (degrees, minutes, seconds)
     """
-    degrees = int(decimal_degrees)
-    minutes_float = abs(decimal_degrees - degrees) * 60.0
-    minutes = int(minutes_float)
-    seconds = (minutes_float - minutes) * 60.0
-    return (degrees, minutes, seconds)
+    centi_arcseconds = round(abs(decimal_degrees) * 360_000)
+    total_minutes, centi_seconds = divmod(centi_arcseconds, 6_000)
+    degrees, minutes = divmod(total_minutes, 60)
+    if decimal_degrees < 0:
+        degrees = -degrees
+    return (degrees, minutes, centi_seconds / 100)
 
 
 def format_dms(degrees: int, minutes: int, seconds: float) -> str:
@@ -32,56 +44,106 @@ def format_dms(degrees: int, minutes: int, seconds: float) -> str:
     return f"{degrees}° {minutes}' {seconds:.2f}\""
 
 
-# Try to import timezone finder libraries
-try:
-    from timezonefinder import TimezoneFinder
-
-    tf_available = True
-except ImportError:
-    try:
-        from timezonefinderL import TimezoneFinder
-
-        tf_available = True
-    except ImportError:
-        tf_available = False
-        print(
-            "Warning: timezonefinder not available. Install with: pip install timezonefinder",
-            file=sys.stderr,
-        )
-
-try:
-    import pytz
-
-    pytz_available = True
-except ImportError:
-    pytz_available = False
+# tzfpy, timezonefinder, geopy and folium are imported where they are first
+# used, so importing this module for its parsing helpers stays cheap
+# tzfpy is an optional, faster timezone backend used in place of timezonefinder
+tzfpy_available = find_spec("tzfpy") is not None
+tf_available = (
+    tzfpy_available
+    or find_spec("timezonefinder") is not None
+    or find_spec("timezonefinderL") is not None
+)
+if not tf_available:
     print(
-        "Warning: pytz not available. Install with: pip install pytz", file=sys.stderr
+        "Warning: timezonefinder not available. Install with: pip install timezonefinder",
+        file=sys.stderr,
     )
 
-try:
-    from geopy.geocoders import Nominatim
-    from geopy.exc import GeocoderTimedOut, GeocoderServiceError
-
-    geopy_available = True
-except ImportError:
-    geopy_available = False
+geopy_available = find_spec("geopy") is not None
+if not geopy_available:
     print(
         "Warning: geopy not available. Install with: pip install geopy", file=sys.stderr
     )
 
-try:
-    import folium
-
-    folium_available = True
-except ImportError:
-    folium_available = False
+folium_available = find_spec("folium") is not None
+if not folium_available:
     print(
         "Warning: folium not available. Install with: pip install folium",
         file=sys.stderr,
     )
 
 
+# Timezone names already looked up, kept on disk across runs
+TZ_CACHE_FILE = ".tz_cache"
+
+# Deletion table for the underscores and whitespace padding the grid lines.
+# Newlines are kept so a cleaned block of lines still splits into lines.
+_STRIP_TBL = str.maketrans("", "", "_ \t\r")
+
+# Candidate digit splits for parse_coordinate_from_digits, tried in order and
+# keyed by digit count (longer strings use the largest key). Each split is
+# (degree digits, minute digits, second digits, check seconds < 60, treat
+# remaining digits as fractional seconds). A minute length of None takes all
+# digits after the degrees.
+# For rows: DDMMSS format (2 digits degrees, 2 digits minutes, 2 digits seconds)
+_ROW_SPLITS = {
+    1: ((1, 0, 0, True, False),),
+    2: ((2, 0, 0, True, False),),
+    3: ((2, 1, 0, True, False),),  # DDM
+    4: ((2, 2, 0, True, False),),  # DDMM
+    5: ((2, 2, 1, True, False),),  # DDMMS
+    6: ((2, 2, 2, True, True),),  # DDMMSS[.fraction]
+}
+# For columns: DDDMMSS format, with fallbacks for shorter or invalid digits
+_COLUMN_SPLITS = {
+    2: ((2, 0, 0, True, False),),
+    3: ((3, 0, 0, True, False),),
+    4: ((2, 2, 0, True, False), (3, 0, 0, True, False)),
+    5: ((2, 2, 1, True, False), (3, 2, 0, True, False), (2, 3, 0, True, False)),
+    6: ((2, 2, 2, True, False), (3, 2, 1, True, False)),
+    7: (
+        (3, 2, 2, True, True),  # DDDMMSS
+        (2, 2, 2, True, True),  # DDMMSS
+        (2, 2, 3, False, True),  # DDMMSSS
+        (2, 3, 2, True, True),  # DDMMMSS
+        (3, None, 0, True, False),  # DDD + remaining digits as minutes
+        (3, 0, 0, True, False),  # DDD only
+    ),
+}
+
+
+def _index_splits(splits_by_len: dict) -> tuple:
+    """Index candidate splits by digit count, with slice ends in place of lengths.
+
+    Entry n holds only the splits that fit n digits; the last entry is used
+    for any longer string. Slice ends are None where minutes take all the
+    remaining digits.
+    """
+    return tuple(
+        tuple(
+            (
+                deg_len,
+                None if min_len is None else deg_len + min_len,
+                None if min_len is None else deg_len + min_len + sec_len,
+                check_seconds,
+                use_fraction,
+            )
+            for deg_len, min_len, sec_len, check_seconds, use_fraction in splits_by_len.get(
+                num_len, ()
+            )
+        )
+        for num_len in range(max(splits_by_len) + 1)
+    )
+
+
+_ROW_SPLIT_BOUNDS = _index_splits(_ROW_SPLITS)
+_COLUMN_SPLIT_BOUNDS = _index_splits(_COLUMN_SPLITS)
+
+# Powers of ten for splitting digit fields off a parsed number, by digit count
+_POW10 = tuple(10**n for n in range(16))
+
+
+@lru_cache(maxsize=4096)
 def parse_coordinate_from_digits(
     digit_string: str, max_value: float, max_digits_before_decimal: int
 ) -> float:
@@ -102,166 +164,77 @@ def parse_coordinate_from_digits(
     if not digit_string:
         return None
 
-    num_len = len(digit_string)
-
-    # For rows: DDMMSS format (2 digits degrees, 2 digits minutes, 2 digits seconds)
     if max_digits_before_decimal == 2:
-        if num_len >= 6:
-            degrees = int(digit_string[:2])
-            minutes = int(digit_string[2:4])
-            seconds = int(digit_string[4:6])
-            # Remaining digits are fractional seconds
-            if num_len > 6:
-                fraction = int(digit_string[6:]) / (10 ** (num_len - 6))
-                seconds += fraction
-        elif num_len == 5:
-            # 5 digits: DDMMS format (2 digits degrees, 2 digits minutes, 1 digit seconds)
-            degrees = int(digit_string[:2])
-            minutes = int(digit_string[2:4])
-            seconds = int(digit_string[4:5])
-        elif num_len == 4:
-            # 4 digits: DDMM format (2 digits degrees, 2 digits minutes)
-            degrees = int(digit_string[:2])
-            minutes = int(digit_string[2:4])
-            seconds = 0
-        elif num_len == 3:
-            # 3 digits: DDM format (2 digits degrees, 1 digit minutes)
-            degrees = int(digit_string[:2])
-            minutes = int(digit_string[2:3])
-            seconds = 0
-        else:
-            degrees = int(digit_string)
-            minutes = 0
-            seconds = 0
-
-        # Validate: minutes and seconds should be < 60
-        if minutes >= 60 or seconds >= 60:
-            # Invalid, try alternative interpretation
-            if num_len == 5:
-                # Try as DDDMM (3 digits degrees, 2 digits minutes) but max is 2 for rows
-                # So this shouldn't happen, but handle gracefully
-                return None
-            return None
-
-        decimal_degrees = degrees + minutes / 60.0 + seconds / 3600.0
-        return decimal_degrees
-
-    # For columns: DDDMMSS format (3 digits degrees, 2 digits minutes, 2 digits seconds)
-    # But we need to be flexible - try different splits and pick valid one
+        splits_by_len = _ROW_SPLIT_BOUNDS
     elif max_digits_before_decimal == 3:
-        # Try different splits: 3-2-2, 2-2-2, 2-2-3, etc.
-        best_result = None
-
-        # Try 3-2-2 split (DDDMMSS)
-        if num_len >= 7:
-            degrees = int(digit_string[:3])
-            minutes = int(digit_string[3:5])
-            seconds = int(digit_string[5:7])
-            if degrees < 180 and minutes < 60 and seconds < 60:
-                fraction = 0
-                if num_len > 7:
-                    fraction = int(digit_string[7:]) / (10 ** (num_len - 7))
-                best_result = degrees + minutes / 60.0 + (seconds + fraction) / 3600.0
-
-        # Try 2-2-2 split (DDMMSS) if 3-2-2 didn't work or was invalid
-        if best_result is None and num_len >= 6:
-            degrees = int(digit_string[:2])
-            minutes = int(digit_string[2:4])
-            seconds = int(digit_string[4:6])
-            if degrees < 180 and minutes < 60 and seconds < 60:
-                fraction = 0
-                if num_len > 6:
-                    fraction = int(digit_string[6:]) / (10 ** (num_len - 6))
-                best_result = degrees + minutes / 60.0 + (seconds + fraction) / 3600.0
-
-        # Try 2-2-3 split (DDMMSSS) if still no result
-        if best_result is None and num_len >= 7:
-            degrees = int(digit_string[:2])
-            minutes = int(digit_string[2:4])
-            seconds = int(digit_string[4:7])
-            if degrees < 180 and minutes < 60:
-                fraction = 0
-                if num_len > 7:
-                    fraction = int(digit_string[7:]) / (10 ** (num_len - 7))
-                best_result = degrees + minutes / 60.0 + (seconds + fraction) / 3600.0
-
-        # Try 2-3-2 split (DDMMMSS)
-        if best_result is None and num_len >= 7:
-            degrees = int(digit_string[:2])
-            minutes = int(digit_string[2:5])
-            seconds = int(digit_string[5:7])
-            if degrees < 180 and minutes < 60 and seconds < 60:
-                fraction = 0
-                if num_len > 7:
-                    fraction = int(digit_string[7:]) / (10 ** (num_len - 7))
-                best_result = degrees + minutes / 60.0 + (seconds + fraction) / 3600.0
-
-        if best_result is not None:
-            return best_result
-
-        # Fallback: try simpler splits for shorter numbers
-        if num_len == 6:
-            # Try 2-2-2 (DDMMSS) - already tried above, but try again as fallback
-            degrees = int(digit_string[:2])
-            minutes = int(digit_string[2:4])
-            seconds = int(digit_string[4:6])
-            if degrees < 180 and minutes < 60 and seconds < 60:
-                return degrees + minutes / 60.0 + seconds / 3600.0
-            # Try 3-2-1 (DDDMMS)
-            degrees = int(digit_string[:3])
-            minutes = int(digit_string[3:5])
-            seconds = int(digit_string[5:6])
-            if degrees < 180 and minutes < 60:
-                return degrees + minutes / 60.0 + seconds / 3600.0
-        elif num_len == 5:
-            # Try 2-2-1 (DDMMS)
-            degrees = int(digit_string[:2])
-            minutes = int(digit_string[2:4])
-            seconds = int(digit_string[4:5])
-            if degrees < 180 and minutes < 60:
-                return degrees + minutes / 60.0 + seconds / 3600.0
-            # Try 3-2 (DDDMM)
-            degrees = int(digit_string[:3])
-            minutes = int(digit_string[3:5])
-            if degrees < 180 and minutes < 60:
-                return degrees + minutes / 60.0
-            # Try 2-3 (DDMMM) - minutes can be > 60 if interpreted differently
-            degrees = int(digit_string[:2])
-            minutes = int(digit_string[2:5])
-            if degrees < 180 and minutes < 60:
-                return degrees + minutes / 60.0
-        elif num_len == 4:
-            # Try 2-2 (DDMM)
-            degrees = int(digit_string[:2])
-            minutes = int(digit_string[2:4])
-            if degrees < 180 and minutes < 60:
-                return degrees + minutes / 60.0
-            # Try 3-1 (DDDM)
-            degrees = int(digit_string[:3])
-            if degrees < 180:
-                return float(degrees)
-        elif num_len >= 3:
-            degrees = int(digit_string[:3])
-            if degrees < 180:
-                if num_len > 3:
-                    minutes = int(digit_string[3:])
-                    if minutes < 60:
-                        return degrees + minutes / 60.0
-                return float(degrees)
-        elif num_len == 2:
-            return float(int(digit_string))
-
+        splits_by_len = _COLUMN_SPLIT_BOUNDS
+    else:
         return None
 
+    # Only the splits that fit this many digits are tried
+    num_len = len(digit_string)
+    splits = splits_by_len[min(num_len, len(splits_by_len) - 1)]
+    pow10 = _POW10 if num_len < len(_POW10) else [10**n for n in range(num_len + 1)]
+    # Convert once and peel each split's fields off with divmod
+    number = int(digit_string)
+
+    # Take the first split that gives valid minutes and seconds
+    for deg_end, min_end, sec_end, check_seconds, use_fraction in splits:
+        if min_end is None:
+            min_end = sec_end = num_len
+
+        # Split off the trailing digits, then seconds, then minutes
+        rest, fraction_digits = divmod(number, pow10[num_len - sec_end])
+        rest, seconds = divmod(rest, pow10[sec_end - min_end])
+        degrees, minutes = divmod(rest, pow10[min_end - deg_end])
+
+        # Only column degrees are range-checked
+        if max_digits_before_decimal == 3 and degrees >= max_value:
+            continue
+        if minutes >= 60 or (check_seconds and seconds >= 60):
+            continue
+
+        # Remaining digits are fractional seconds
+        fraction = 0
+        if use_fraction and num_len > sec_end:
+            fraction = fraction_digits / pow10[num_len - sec_end]
+        return degrees + minutes / 60.0 + (seconds + fraction) / 3600.0
+
     return None
 
 
+def parse_coordinates_from_digits(
+    digit_strings: List[str], max_value: float, max_digits_before_decimal: int
+) -> List[float]:
+    """Parse a batch of digit strings, returning None for any that fail to parse.
+
+    Goes through the cached single-string parser, so a digit string seen
+    before is not parsed again.
+    """
+    return [
+        parse_coordinate_from_digits(digit_string, max_value, max_digits_before_decimal)
+        for digit_string in digit_strings
+    ]
+
+
+# Popup shown for each point on the world map
+_POPUP_TMPL = (
+    "<b>Pair {pair} - {combo}</b><br>"
+    "Coordinates: {dms}<br>"
+    "Decimal: ({lat:.6f}, {lon:.6f})<br>"
+    "Timezone: {timezone}<br>"
+    "{offset}"
+)
+
+
 def create_world_map(points: List[dict]):
     """Create an interactive world map with all coordinate points marked."""
     # Calculate center of all points
     if not points:
         return
 
+    import folium
+
     avg_lat = sum(p["lat"] for p in points) / len(points)
     avg_lon = sum(p["lon"] for p in points) / len(points)
 
@@ -279,28 +252,23 @@ def create_world_map(points: List[dict]):
         combo = point["combo"]
         timezone = point["timezone"]
         offset = point["offset"]
-        dms = point["dms"]
+        color = combo_colors.get(combo, "gray")
 
         # Create popup text
-        popup_text = f"""
-        <b>Pair {pair} - {combo}</b><br>
-        Coordinates: {dms}<br>
-        Decimal: ({lat:.6f}, {lon:.6f})<br>
-        Timezone: {timezone}<br>
-        """
         if offset is not None:
-            popup_text += f"GMT Offset: {offset:+.2f} hours"
+            offset_text = f"GMT Offset: {offset:+.2f} hours"
         else:
-            popup_text += "GMT Offset: N/A"
+            offset_text = "GMT Offset: N/A"
+        popup_text = _POPUP_TMPL.format_map({**point, "offset": offset_text})
 
         # Add marker
         folium.CircleMarker(
             location=[lat, lon],
             radius=8,
             popup=folium.Popup(popup_text, max_width=300),
-            color=combo_colors.get(combo, "gray"),
+            color=color,
             fill=True,
-            fillColor=combo_colors.get(combo, "gray"),
+            fillColor=color,
             fillOpacity=0.7,
             tooltip=f"Pair {pair} ({combo}): {timezone}",
         ).add_to(m)
@@ -327,14 +295,42 @@ def create_world_map(points: List[dict]):
     print(f"Open {output_file} in your web browser to view the map")
 
 
+# Number of reverse geocoding requests kept in flight at once
+GEOCODE_WORKERS = 5
+
+
+@lru_cache(maxsize=1)
+def get_reverse_geocoder():
+    """Get a shared, rate-limited Nominatim reverse geocoder.
+
+    A single geocoder keeps its HTTP session open across lookups. The rate
+    limiter keeps requests at least a second apart, as Nominatim's usage
+    policy requires, and retries failed requests before giving up.
+    """
+    from geopy.geocoders import Nominatim
+    from geopy.adapters import RequestsAdapter
+    from geopy.extra.rate_limiter import RateLimiter
+
+    geolocator = Nominatim(user_agent="timezone_lookup", adapter_factory=RequestsAdapter)
+    return RateLimiter(
+        geolocator.reverse,
+        min_delay_seconds=1,
+        max_retries=3,
+        error_wait_seconds=2.0,
+        swallow_exceptions=True,
+    )
+
+
 def get_location_name(lat: float, lon: float) -> str:
     """Get city/location name for given coordinates using reverse geocoding."""
     if not geopy_available:
         return None
 
+    from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+
     try:
-        geolocator = Nominatim(user_agent="timezone_lookup")
-        location = geolocator.reverse((lat, lon), timeout=10, exactly_one=True)
+        reverse = get_reverse_geocoder()
+        location = reverse((lat, lon), timeout=10, exactly_one=True)
         if location:
             address = location.raw.get("address", {})
             # Try to get city, town, or village name
@@ -354,24 +350,139 @@ def get_location_name(lat: float, lon: float) -> str:
     return None
 
 
+def get_location_names_batch(coords: List[Tuple[float, float]]) -> List[str]:
+    """Get location names for a list of (lat, lon) coordinates.
+
+    The lookups run on a small thread pool so their network round trips
+    overlap. They share one geocoder session, and its rate limiter still
+    spaces the requests out, so the pool never exceeds Nominatim's limit.
+    """
+    with ThreadPoolExecutor(max_workers=GEOCODE_WORKERS) as executor:
+        return list(executor.map(lambda coord: get_location_name(*coord), coords))
+
+
+@lru_cache(maxsize=1)
+def get_timezone_finder():
+    """Get a shared TimezoneFinder instance.
+
+    Building a finder loads the timezone polygon data, so it is done once
+    and the data is kept in memory for the lookups that follow. The finder
+    is not pickled between runs: it holds memoryviews that cannot be
+    pickled, and loading a pickle from a shared directory would run
+    whatever code it contains. Building it takes a fraction of a second.
+    """
+    try:
+        from timezonefinder import TimezoneFinder
+    except ImportError:
+        from timezonefinderL import TimezoneFinder
+
+    try:
+        return TimezoneFinder(in_memory=True)
+    except TypeError:
+        # timezonefinderL has no in_memory option
+        return TimezoneFinder()
+
+
+@lru_cache(maxsize=512)
+def get_utc_offset(tz_name: str, hour: int) -> float:
+    """Get GMT offset in hours for a timezone at the given hour since the epoch.
+
+    Callers read the clock once and pass the same hour for every point, so
+    the zone lookup and offset calculation are done once per zone.
+    Returns None if the zone is missing from the installed tz database.
+    """
+    try:
+        tz = ZoneInfo(tz_name)
+    except ZoneInfoNotFoundError:
+        return None
+    offset_seconds = datetime.fromtimestamp(hour * 3600, tz).utcoffset().total_seconds()
+    return offset_seconds / 3600.0
+
+
+def current_hour() -> int:
+    """Get the current time as whole hours since the epoch."""
+    return int(time.time() // 3600)
+
+
+@lru_cache(maxsize=1)
+def get_timezone_lookup():
+    """Get the function used to look up a timezone name from (lat, lon).
+
+    Uses tzfpy when it is installed: its Rust index answers in microseconds,
+    though its simplified polygons can differ from timezonefinder right at
+    zone borders. Otherwise falls back to the shared TimezoneFinder.
+
+    Returns:
+        Function taking (lat, lon) and returning a timezone name or None
+    """
+    if tzfpy_available:
+        from tzfpy import get_tz
+
+        def _lookup(lat: float, lon: float) -> str:
+            return get_tz(lon, lat) or None
+
+        return _lookup
+
+    timezone_at = get_timezone_finder().timezone_at
+
+    def _lookup(lat: float, lon: float) -> str:
+        return timezone_at(lat=lat, lng=lon)
+
+    return _lookup
+
+
+@lru_cache(maxsize=1)
+def get_timezone_backend() -> str:
+    """Get the name and version of the package that get_timezone_lookup uses.
+
+    Returns:
+        String like "timezonefinder 9.0.0"
+    """
+    if tzfpy_available:
+        package = "tzfpy"
+    elif find_spec("timezonefinder") is not None:
+        package = "timezonefinder"
+    else:
+        package = "timezonefinderL"
+    try:
+        version = metadata.version(package)
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    return f"{package} {version}"
+
+
+def get_timezone_names(points: List[Tuple[float, float]]) -> List[str]:
+    """Get the timezone name for each (lat, lon) point, caching names on disk.
+
+    Points are keyed on the lookup backend and version plus the coordinates
+    to 5 decimal places (about a metre). The backend is only loaded on a
+    cache miss, so a rerun on the same data skips loading the polygon data.
+    """
+    backend = get_timezone_backend()
+    lookup = None
+    tz_names = []
+    with shelve.open(TZ_CACHE_FILE) as cache:
+        for lat, lon in points:
+            key = f"{backend}|{lat:.5f},{lon:.5f}"
+            tz_name = cache.get(key)
+            if tz_name is None:
+                if lookup is None:
+                    lookup = get_timezone_lookup()
+                # Points with no timezone are stored as "" so they are not looked up again
+                tz_name = cache[key] = lookup(lat, lon) or ""
+            tz_names.append(tz_name or None)
+    return tz_names
+
+
 def get_timezone_info(lat: float, lon: float) -> Tuple[str, float]:
     """Get timezone name and GMT offset for given coordinates."""
     if not tf_available:
         return None, None
 
-    tf = TimezoneFinder()
-    tz_name = tf.timezone_at(lat=lat, lng=lon)
-
-    if tz_name and pytz_available:
-        tz = pytz.timezone(tz_name)
-        # Get UTC offset
-        now = datetime.now(tz)
-        offset_seconds = now.utcoffset().total_seconds()
-        offset_hours = offset_seconds / 3600.0
-        return tz_name, offset_hours
-    elif tz_name:
-        # If we have timezone name but no pytz, just return the name
-        return tz_name, None
+    tz_name = get_timezone_lookup()(lat, lon)
+
+    if tz_name:
+        return tz_name, get_utc_offset(tz_name, current_hour())
     else:
         return None, None
 
@@ -379,8 +490,7 @@ def get_timezone_info(lat: float, lon: float) -> Tuple[str, float]:
 def main():
     # Try to read from file, otherwise use embedded data
     try:
-        with open("data.txt", "r") as f:
-            lines = [line.rstrip("\n") for line in f.readlines()]
+        lines = Path("data.txt").read_text().splitlines()
     except FileNotFoundError:
         # Data from the file
         data = """336111111752
@@ -407,11 +517,7 @@ ___642148___
         lines = data.strip().split("\n")
 
     # Find the separator (empty line)
-    separator_idx = None
-    for i, line in enumerate(lines):
-        if not line.strip():
-            separator_idx = i
-            break
+    separator_idx = next((i for i, line in enumerate(lines) if not line.strip()), None)
 
     if separator_idx is None:
         print("Error: Could not find separator between columns and rows")
@@ -421,19 +527,17 @@ ___642148___
     # For each column position (0-11), extract digits from top to bottom
     column_lines = lines[:separator_idx]
 
-    # Clean lines (remove underscores)
-    cleaned_column_lines = []
-    for line in column_lines:
-        cleaned = line.replace("_", "").strip()
-        if cleaned:
-            cleaned_column_lines.append(cleaned)
+    # Clean the whole section in one pass (remove underscores and whitespace),
+    # then split it back into its non-empty lines
+    cleaned_column_lines = "\n".join(column_lines).translate(_STRIP_TBL).split()
 
     # Read offsets from file
     column_signs = []
     row_signs = []
     try:
-        with open("offests.txt", "r") as f:
-            offset_lines = [line.strip() for line in f.readlines() if line.strip()]
+        offset_lines = [
+            line.strip() for line in Path("offests.txt").read_text().splitlines() if line.strip()
+        ]
         if len(offset_lines) >= 1:
             # First row: sign pattern for columns (each char is + or -)
             # Reverse interpretation: + becomes - and - becomes +
@@ -447,35 +551,34 @@ ___642148___
     except Exception as e:
         print(f"Warning: Error reading offsets: {e}. Proceeding without sign offsets.")
 
-    columns = []
     # Extract 12 columns by taking digit at each position (0-11) from top to bottom
-    for col_idx in range(12):
-        col_digits = []
-        for cleaned_line in cleaned_column_lines:
-            if col_idx < len(cleaned_line):
-                col_digits.append(cleaned_line[col_idx])
-
-        if col_digits:
-            # Combine digits from top to bottom
-            digit_string = "".join(col_digits)
-            # Parse by finding decimal placement so result < 180, max 3 digits before decimal
-            coord = parse_coordinate_from_digits(digit_string, 180.0, 3)
-            if coord is not None:
-                # Keep base coordinate positive, signs will be applied later
-                columns.append((digit_string, abs(coord)))
+    # Transpose the cleaned lines; a line too short for a column adds no digit to it
+    column_strings = [
+        "".join(col_digits)
+        for col_digits in zip_longest(*cleaned_column_lines, fillvalue="")
+    ][:12]
+
+    # Parse by finding decimal placement so result < 180, max 3 digits before decimal
+    column_coords = parse_coordinates_from_digits(column_strings, 180.0, 3)
+    # Parsed values are never negative, signs will be applied later
+    columns = [
+        (digit_string, coord)
+        for digit_string, coord in zip(column_strings, column_coords)
+        if coord is not None
+    ]
 
     # Extract rows (second section) - take all 12 rows
     row_lines = lines[separator_idx + 1 :]
-    rows = []
-    for row_idx, line in enumerate(row_lines):
-        if line.strip():
-            cleaned = line.replace("_", "").strip()
-            if cleaned:
-                # Parse by finding decimal placement so result < 90, max 2 digits before decimal
-                coord = parse_coordinate_from_digits(cleaned, 90.0, 2)
-                if coord is not None:
-                    # Keep base coordinate positive, signs will be applied later
-                    rows.append((cleaned, abs(coord)))
+    row_strings = "\n".join(row_lines).translate(_STRIP_TBL).split()
+
+    # Parse by finding decimal placement so result < 90, max 2 digits before decimal
+    row_coords = parse_coordinates_from_digits(row_strings, 90.0, 2)
+    # Parsed values are never negative, signs will be applied later
+    rows = [
+        (digit_string, coord)
+        for digit_string, coord in zip(row_strings, row_coords)
+        if coord is not None
+    ]
     # Ensure we have exactly 12 rows
     rows = rows[:12]
 
@@ -489,8 +592,8 @@ ___642148___
         print("  pip install timezonefinderL")
         return
 
-    # Get timezone for each point
-    tf = TimezoneFinder()
+    # Read the clock once so every point's offset is for the same instant
+    hour = current_hour()
 
     # Process matching pairs: row 1→col 1, row 2→col 2, etc. (12 pairs total)
     num_pairs = min(len(rows), len(columns))
@@ -498,90 +601,95 @@ ___642148___
 
     # Store all points for map visualization
     all_points = []
+    # Collect the report, one string per pair, and write it to stdout in one go
+    output = []
+    write = output.append
+
+    # Apply signs from offsets file
+    # Row sign determines latitude sign, column sign determines longitude sign
+    # Pairs without a sign in the file keep a positive sign
+    lat_signs = (row_signs + [1] * num_pairs)[:num_pairs]
+    lon_signs = (column_signs + [1] * num_pairs)[:num_pairs]
+
+    pairs = list(zip(rows, columns, lat_signs, lon_signs))
+
+    # Validate coordinates once, before any lookup or formatting work
+    in_range = [row_val <= 90 and col_val <= 180 for (_, row_val), (_, col_val), _, _ in pairs]
+
+    # Get timezone for each in-range point in one batch
+    tz_names = iter(
+        get_timezone_names(
+            [
+                (row_val * lat_sign, col_val * lon_sign)
+                for ((_, row_val), (_, col_val), lat_sign, lon_sign), valid in zip(pairs, in_range)
+                if valid
+            ]
+        )
+    )
 
-    for idx in range(num_pairs):
-        row_str, row_val = rows[idx]
-        col_str, col_val = columns[idx]
-
-        # Apply signs from offsets file
-        # Row sign determines latitude sign, column sign determines longitude sign
-        lat_sign = row_signs[idx] if idx < len(row_signs) else 1
-        lon_sign = column_signs[idx] if idx < len(column_signs) else 1
+    for idx, (pair, valid) in enumerate(zip(pairs, in_range)):
+        (row_str, row_val), (col_str, col_val), lat_sign, lon_sign = pair
 
         # Calculate final coordinates with applied signs
         lat_val = row_val * lat_sign
         lon_val = col_val * lon_sign
 
+        if not valid:
+            write(
+                f"Pair {idx + 1} (row={row_str}, col={col_str}):\n"
+                f"  Warning: Coordinates ({lat_val:.6f}, {lon_val:.6f}) are out of valid range\n"
+                "\n"
+            )
+            continue
+
+        tz_name = next(tz_names)
+
         # Determine direction strings
         lat_dir = "N" if lat_val >= 0 else "S"
         lon_dir = "E" if lon_val >= 0 else "W"
         sign_combo = ("+" if lat_sign > 0 else "-") + ("+" if lon_sign > 0 else "-")
 
-        # Validate coordinates
-        if abs(lat_val) > 90 or abs(lon_val) > 180:
-            print(f"Pair {idx + 1} (row={row_str}, col={col_str}):")
-            print(
-                f"  Warning: Coordinates ({lat_val:.6f}, {lon_val:.6f}) are out of valid range"
-            )
-            print()
-            continue
-
-        tz_name = tf.timezone_at(lat=lat_val, lng=lon_val)
-
         # Get location name (commented out for now)
         # location_name = get_location_name(lat_val, lon_val)
 
-        # Convert to DMS format
-        lat_d, lat_m, lat_s = decimal_to_dms(abs(lat_val))
-        lon_d, lon_m, lon_s = decimal_to_dms(abs(lon_val))
-
-        print(f"Pair {idx + 1} (row={row_str}, col={col_str}):")
-        print(
-            f"  Coordinates: {format_dms(lat_d, lat_m, lat_s)} {lat_dir}, {format_dms(lon_d, lon_m, lon_s)} {lon_dir}"
-        )
-        print(f"    (Decimal: {lat_val:+.6f}, {lon_val:+.6f})")
-        print(f"    Sign combination: {sign_combo}")
+        # Convert to DMS format; the unsigned values are the magnitudes
+        lat_d, lat_m, lat_s = decimal_to_dms(row_val)
+        lon_d, lon_m, lon_s = decimal_to_dms(col_val)
+        dms = f"{format_dms(lat_d, lat_m, lat_s)} {lat_dir}, {format_dms(lon_d, lon_m, lon_s)} {lon_dir}"
 
         if tz_name:
-            if pytz_available:
-                tz = pytz.timezone(tz_name)
-                now = datetime.now(tz)
-                offset_seconds = now.utcoffset().total_seconds()
-                offset_hours = offset_seconds / 3600.0
-                print(f"    Timezone: {tz_name}")
-                print(f"    GMT Offset: {offset_hours:+.2f} hours")
-
-                # Store point for map
-                all_points.append(
-                    {
-                        "lat": lat_val,
-                        "lon": lon_val,
-                        "pair": idx + 1,
-                        "combo": sign_combo,
-                        "timezone": tz_name,
-                        "offset": offset_hours,
-                        "dms": f"{format_dms(lat_d, lat_m, lat_s)} {lat_dir}, {format_dms(lon_d, lon_m, lon_s)} {lon_dir}",
-                    }
-                )
+            offset_hours = get_utc_offset(tz_name, hour)
+            if offset_hours is not None:
+                offset_text = f"{offset_hours:+.2f} hours"
             else:
-                print(f"    Timezone: {tz_name}")
-                print(f"    GMT Offset: (pytz not available to calculate)")
-
-                # Store point for map
-                all_points.append(
-                    {
-                        "lat": lat_val,
-                        "lon": lon_val,
-                        "pair": idx + 1,
-                        "combo": sign_combo,
-                        "timezone": tz_name,
-                        "offset": None,
-                        "dms": f"{format_dms(lat_d, lat_m, lat_s)} {lat_dir}, {format_dms(lon_d, lon_m, lon_s)} {lon_dir}",
-                    }
-                )
+                offset_text = "N/A"
+            timezone_text = f"    Timezone: {tz_name}\n    GMT Offset: {offset_text}"
+
+            # Store point for map
+            all_points.append(
+                {
+                    "lat": lat_val,
+                    "lon": lon_val,
+                    "pair": idx + 1,
+                    "combo": sign_combo,
+                    "timezone": tz_name,
+                    "offset": offset_hours,
+                    "dms": dms,
+                }
+            )
         else:
-            print(f"    Timezone: Not found")
-        print()
+            timezone_text = "    Timezone: Not found"
+
+        write(
+            f"Pair {idx + 1} (row={row_str}, col={col_str}):\n"
+            f"  Coordinates: {dms}\n"
+            f"    (Decimal: {lat_val:+.6f}, {lon_val:+.6f})\n"
+            f"    Sign combination: {sign_combo}\n"
+            f"{timezone_text}\n"
+            "\n"
+        )
+
+    sys.stdout.write("".join(output))
 
     # Create world map with all points
     if folium_available and all_points: